@@ -1,132 +1,257 @@
+import os
+import tempfile
+from pathlib import Path
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import altair as alt
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pyarrow import parquet as pq
 
 # --- App Config ---
 st.set_page_config(page_title="🚀 Startup Funding Dashboard", layout="wide")
 st.title("🚀 Startup Funding Analysis")
 
-# --- Load Dataset ---
-df = pd.read_csv("Startup.csv")
+# --- Load, Clean & Enrich (cached across reruns) ---
+# Everything the charts and the data preview show, in CSV order; Year and Month are recomputed from Date
+COLUMNS = [
+    "Date", "Startup Name", "Industry Vertical", "SubVertical", "City Location",
+    "Investors Name", "InvestmentnType", "Amount in USD", "Year", "Month", "Day",
+]
+# Bump whenever the cleaning below changes so stale Parquet caches are not reused
+CACHE_VERSION = 9
+
+# mtime is part of the cache key so an edited CSV is picked up without a restart
+@st.cache_data
+def load_data(path, mtime):
+    # Cold starts reuse the cleaned frame from Parquet; clean from the CSV only when it's missing or stale
+    cache_path = Path(path).with_suffix(f".cleaned-v{CACHE_VERSION}.parquet")
+    # The cache records the mtime and size of the CSV it was built from and is only trusted on an
+    # exact match, so a CSV swapped in with an older mtime (cp -p, rsync -t) still rebuilds it.
+    # A missing or unreadable cache is rebuilt too
+    source = Path(path).stat()
+    fingerprint = f"{source.st_mtime_ns}:{source.st_size}".encode()
+    try:
+        if (pq.read_schema(cache_path).metadata or {}).get(b"source_csv") == fingerprint:
+            return pd.read_parquet(cache_path)
+    except (OSError, pa.ArrowException):
+        pass
+    # Arrow's multithreaded reader, materializing only COLUMNS. Date stays a
+    # string so to_datetime picks the unit, keeping fresh and Parquet-cached frames identical
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=COLUMNS,
+        column_types={"Date": pa.string()},
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(path, convert_options=convert_options)
+    df = table.to_pandas()
+    df["Amount in USD"] = pd.to_numeric(df["Amount in USD"], errors="coerce")
+    df["Date"] = pd.to_datetime(df["Date"], format="ISO8601", errors="coerce")
+    df = df.dropna(subset=["Amount in USD", "City Location", "Startup Name", "Investors Name", "Industry Vertical", "Date"])
+    # Narrow the calendar columns only: amounts stay 64-bit, float32 would round values above 2**24
+    df["Year"] = pd.to_numeric(df["Date"].dt.year, downcast="integer")
+    df["Month"] = pd.to_numeric(df["Date"].dt.month, downcast="integer")
+    # Integer month key (months since year 0) so monthly groupbys avoid Period objects
+    df["YearMonth"] = (df["Year"].astype("int32") * 12 + df["Month"] - 1).astype("int32")
+    # Grouping keys as categoricals: groupby/isin work on integer codes
+    for col in ["City Location", "Industry Vertical", "Startup Name", "Investors Name"]:
+        df[col] = df[col].astype("category")
+    # Newest year first (the CSV's own order) so any year range is one contiguous block
+    df = df.sort_values("Year", ascending=False, kind="stable")
+    # Write to a temp file and swap it in so a crash never leaves a truncated cache;
+    # if the directory isn't writable, just run without the cache
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.stem}-", suffix=".parquet")
+        os.close(fd)
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**table.schema.metadata, b"source_csv": fingerprint})
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+    return df
+
+@st.cache_data
+def get_filter_options(path, mtime):
+    df = load_data(path, mtime)
+    # Categories are already deduplicated and sorted (cast after dropna), so no column scan
+    return {
+        "cities": df["City Location"].cat.categories.tolist(),
+        "industries": df["Industry Vertical"].cat.categories.tolist(),
+        "years": sorted(df["Year"].unique()),
+        "amount_min": int(df["Amount in USD"].min()),
+        "amount_max": int(df["Amount in USD"].max()),
+    }
 
-# --- Clean & Enrich ---
-df["Amount in USD"] = pd.to_numeric(df["Amount in USD"], errors="coerce")
-df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-df.dropna(subset=["Amount in USD", "City Location", "Startup Name", "Investors Name", "Industry Vertical", "Date"], inplace=True)
-df["Year"] = df["Date"].dt.year
-df["Month"] = df["Date"].dt.month
+DATA_PATH = "Startup.csv"
+data_mtime = Path(DATA_PATH).stat().st_mtime
+df = load_data(DATA_PATH, data_mtime)
+options = get_filter_options(DATA_PATH, data_mtime)
 
 # --- Sidebar Filters ---
 st.sidebar.header("📍 Filter Options")
 
-city_list = sorted(df["City Location"].dropna().unique())
-industry_list = sorted(df["Industry Vertical"].dropna().unique())
-year_list = sorted(df["Year"].dropna().unique())
+city_list = options["cities"]
+industry_list = options["industries"]
+year_list = options["years"]
 
 selected_cities = st.sidebar.multiselect("Select City(s)", city_list, default=city_list[:3])
 selected_industries = st.sidebar.multiselect("Select Industry(s)", industry_list, default=industry_list[:3])
 selected_years = st.sidebar.slider("Select Year Range", min_value=int(min(year_list)), max_value=int(max(year_list)), value=(int(min(year_list)), int(max(year_list))))
 
-amount_min = int(df["Amount in USD"].min())
-amount_max = int(df["Amount in USD"].max())
+amount_min = options["amount_min"]
+amount_max = options["amount_max"]
 amount_range = st.sidebar.slider("Funding Amount Range (USD)", min_value=amount_min, max_value=amount_max, value=(amount_min, amount_max))
 
 show_top_10 = st.sidebar.checkbox("Show only Top 10 in charts", value=True)
 
 # --- Apply Filters ---
-filtered_df = df.copy()
-filtered_df = filtered_df[
-    (filtered_df["City Location"].isin(selected_cities)) &
-    (filtered_df["Industry Vertical"].isin(selected_industries)) &
-    (filtered_df["Year"].between(selected_years[0], selected_years[1])) &
-    (filtered_df["Amount in USD"].between(amount_range[0], amount_range[1]))
-]
+# The data file's mtime plus the widget selections fully identify filtered_df
+filter_key = (data_mtime, tuple(sorted(selected_cities)), tuple(sorted(selected_industries)), selected_years, amount_range)
+
+# Reruns that don't touch a filter (e.g. the Top 10 toggle) reuse the last filtered frame
+if st.session_state.get("filter_key") != filter_key:
+    # Rows are grouped by year (newest first): binary-search the range on the reversed view
+    # and slice, so the remaining masks only scan the selected years
+    years = df["Year"].to_numpy()[::-1]
+    start = len(years) - np.searchsorted(years, selected_years[1], side="right")
+    stop = len(years) - np.searchsorted(years, selected_years[0], side="left")
+    block = df.iloc[start:stop]
+    amounts = block["Amount in USD"].to_numpy()
+    mask = np.logical_and.reduce([
+        block["City Location"].isin(selected_cities).to_numpy(),
+        block["Industry Vertical"].isin(selected_industries).to_numpy(),
+        amounts >= amount_range[0],
+        amounts <= amount_range[1],
+    ])
+    st.session_state.filtered_df = block[mask]
+    st.session_state.filter_key = filter_key
+filtered_df = st.session_state.filtered_df
+
+# --- Aggregation Helper ---
+GROUP_KEYS = ["Startup Name", "Investors Name", "Industry Vertical", "City Location"]
+
+def group_totals(data, key):
+    # Funding sum and deal count per category from two bincounts over the codes
+    codes = data[key].cat.codes.to_numpy()
+    categories = data[key].cat.categories
+    counts = np.bincount(codes, minlength=len(categories))
+    sums = np.bincount(codes, weights=data["Amount in USD"].to_numpy(), minlength=len(categories))
+    observed = counts > 0
+    return pd.DataFrame(
+        {"Amount in USD": sums[observed], "count": counts[observed]},
+        index=categories[observed].rename(key),
+    )
+
+# Cached on filter_key; the underscore keeps Streamlit from hashing the frame itself
+@st.cache_data(max_entries=256)
+def chart_totals(_data, filter_key):
+    return {key: group_totals(_data, key) for key in GROUP_KEYS}
+
+def rank(totals, top_10):
+    return totals.nlargest(10) if top_10 else totals.sort_values(ascending=False)
+
+@st.cache_data(max_entries=256)
+def monthly_totals(_data, filter_key):
+    monthly = _data.groupby("YearMonth")["Amount in USD"].sum()
+    # Format labels only for the months present, not for every row
+    year, month = np.divmod(monthly.index.to_numpy(), 12)
+    labels = pd.Series(year).astype(str) + "-" + pd.Series(month + 1).astype(str).str.zfill(2)
+    return pd.DataFrame({"Date": labels.to_numpy(), "Amount in USD": monthly.to_numpy()})
+
+@st.cache_data(max_entries=256)
+def yearly_by_industry(_data, filter_key, top_10):
+    # Zero-filled Year x Industry totals, returned long-form for plotting
+    sums = _data.groupby(["Year", "Industry Vertical"], observed=True)["Amount in USD"].sum()
+    years = sums.index.get_level_values("Year").unique()
+    if top_10:
+        # Keep only the top industries before pivoting so the dense matrix stays Years x 10
+        top = sums.groupby(level="Industry Vertical", observed=True, sort=False).sum().nlargest(10).index
+        sums = sums[sums.index.get_level_values("Industry Vertical").isin(top)]
+        sums.index = sums.index.remove_unused_levels()
+    # Years where none of the kept industries raised funding still plot as zeros
+    pivot = sums.unstack(fill_value=0).reindex(years.sort_values(), fill_value=0)
+    return pivot.stack().rename("Amount in USD").reset_index()
 
 # --- Chart Function ---
+# Charts are sent to the browser as Vega-Lite specs and rendered client-side
 def render_bar_chart(data, x, y, title):
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(data=data, x=x, y=y, ax=ax)
-    ax.set_title(title)
-    ax.tick_params(axis='x', rotation=45)
-    st.pyplot(fig)
+    chart = alt.Chart(data.astype({y: str}), title=title).mark_bar().encode(
+        x=alt.X(x, type="quantitative"),
+        y=alt.Y(y, type="nominal", sort="-x"),
+    )
+    st.altair_chart(chart, use_container_width=True)
 
 def render_line_chart(data, x, y, title):
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.lineplot(data=data, x=x, y=y, marker="o", ax=ax)
-    ax.set_title(title)
-    ax.tick_params(axis='x', rotation=45)
-    st.pyplot(fig)
+    chart = alt.Chart(data, title=title).mark_line(point=True).encode(
+        x=alt.X(x, type="ordinal"),
+        y=alt.Y(y, type="quantitative"),
+    )
+    st.altair_chart(chart, use_container_width=True)
 
 # --- Data Preview ---
 st.subheader("📊 Filtered Dataset Preview")
-st.dataframe(filtered_df.head(50), use_container_width=True)
+st.dataframe(filtered_df.head(50).drop(columns="YearMonth"), use_container_width=True)
 
 if filtered_df.empty:
     st.warning("⚠️ No data available for the selected filters.")
 else:
+    totals = chart_totals(filtered_df, filter_key)
+
     # --- Row 1 ---
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("🏆 Top Funded Startups")
-        top_startups = filtered_df.groupby("Startup Name")["Amount in USD"].sum().sort_values(ascending=False)
-        if show_top_10:
-            top_startups = top_startups.head(10)
+        top_startups = rank(totals["Startup Name"]["Amount in USD"], show_top_10)
         render_bar_chart(top_startups.reset_index(), "Amount in USD", "Startup Name", "Top Funded Startups")
 
     with col2:
         st.subheader("💰 Top Investors")
-        top_investors = filtered_df.groupby("Investors Name")["Amount in USD"].sum().sort_values(ascending=False)
-        if show_top_10:
-            top_investors = top_investors.head(10)
+        top_investors = rank(totals["Investors Name"]["Amount in USD"], show_top_10)
         render_bar_chart(top_investors.reset_index(), "Amount in USD", "Investors Name", "Top Investors")
 
     # --- Row 2 ---
     col3, col4 = st.columns(2)
     with col3:
         st.subheader("📈 Monthly Funding Trend")
-        monthly = filtered_df.groupby(filtered_df["Date"].dt.to_period("M"))["Amount in USD"].sum().reset_index()
-        monthly["Date"] = monthly["Date"].astype(str)
+        monthly = monthly_totals(filtered_df, filter_key)
         render_line_chart(monthly, "Date", "Amount in USD", "Monthly Funding Trend")
 
     with col4:
         st.subheader("🏭 Industry Funding")
-        top_industry = filtered_df.groupby("Industry Vertical")["Amount in USD"].sum().sort_values(ascending=False)
-        if show_top_10:
-            top_industry = top_industry.head(10)
+        top_industry = rank(totals["Industry Vertical"]["Amount in USD"], show_top_10)
         render_bar_chart(top_industry.reset_index(), "Amount in USD", "Industry Vertical", "Funding by Industry")
 
     # --- Row 3 ---
     col5, col6 = st.columns(2)
     with col5:
         st.subheader("🔢 Funding Count by Industry")
-        industry_count = filtered_df["Industry Vertical"].value_counts()
-        if show_top_10:
-            industry_count = industry_count.head(10)
+        industry_count = rank(totals["Industry Vertical"]["count"], show_top_10)
         render_bar_chart(industry_count.reset_index(), "count", "Industry Vertical", "Industry Count")
         
     with col6:
         st.subheader("🌆 Funding by City")
-        city_funding = filtered_df.groupby("City Location")["Amount in USD"].sum().sort_values(ascending=False)
-        if show_top_10:
-            city_funding = city_funding.head(10)
+        city_funding = rank(totals["City Location"]["Amount in USD"], show_top_10)
         render_bar_chart(city_funding.reset_index(), "Amount in USD", "City Location", "City-wise Funding")
 
     # --- Row 4 (Extra Insightful Chart) ---
     col7, col8 = st.columns(2)
     with col7:
         st.subheader("📅 Yearly Trend by Sector")
-        yearly_sector = filtered_df.groupby(["Year", "Industry Vertical"])["Amount in USD"].sum().reset_index()
-        pivot = yearly_sector.pivot(index="Year", columns="Industry Vertical", values="Amount in USD").fillna(0)
-        fig, ax = plt.subplots(figsize=(6, 4))
-        pivot.plot(ax=ax)
-        ax.set_title("Yearly Trend by Sector")
-        st.pyplot(fig)
+        trend = yearly_by_industry(filtered_df, filter_key, show_top_10)
+        chart = alt.Chart(trend, title="Yearly Trend by Sector").mark_line().encode(
+            x=alt.X("Year", type="ordinal"),
+            y=alt.Y("Amount in USD", type="quantitative"),
+            color=alt.Color("Industry Vertical", type="nominal"),
+        )
+        st.altair_chart(chart, use_container_width=True)
 
     with col8:
         st.subheader("🌍 Startup Count per City")
-        city_count = filtered_df["City Location"].value_counts()
-        if show_top_10:
-            city_count = city_count.head(10)
+        city_count = rank(totals["City Location"]["count"], show_top_10)
         render_bar_chart(city_count.reset_index(), "count", "City Location", "Startups per City")
 